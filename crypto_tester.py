@@ -0,0 +1,224 @@
+# tests/test_crypto_parse.py
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import data_load.crypto as crypto
+
+
+class _FakeResp:
+    def __init__(self, rows):
+        self.status_code = 200
+        self.headers = {}
+        self.content = json.dumps(rows).encode()
+
+    def raise_for_status(self):
+        pass
+
+
+class _FakeSession:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def get(self, url, params=None, timeout=None):
+        return _FakeResp(self.rows)
+
+
+def _row(t, trades=7, close="100.1"):
+    # Binance kline 한 행(12열, 마지막 ignore 포함)
+    return [t, "100.5", "101.25", "99.0", close, "1.5", t + 59_999, "555.5", trades, "1.5", "2.5", "0"]
+
+
+def _load(monkeypatch, rows):
+    monkeypatch.setattr(crypto, "_SESSION", _FakeSession(rows))
+    monkeypatch.setattr(crypto, "_PAGE_CACHE_DIR", "")  # 디스크 캐시 사용 안 함
+    crypto._fetch_closed_page.cache_clear()
+    try:
+        st = rows[0][0]
+        return crypto.pagination(crypto._KLINES_URL["spot"], "BTCUSDT", "1m", st, st + 60_000 * (len(rows) - 1), 1000)
+    finally:
+        crypto._fetch_closed_page.cache_clear()
+
+
+def test_trades_int64(monkeypatch):
+    df = _load(monkeypatch, [_row(1_704_380_400_000), _row(1_704_380_460_000)])
+    assert df["trades"].dtype == np.int64
+    assert df["trades"].tolist() == [7, 7]
+
+
+def test_null_trades_falls_back_to_Int64(monkeypatch):
+    df = _load(monkeypatch, [_row(1_704_380_400_000), _row(1_704_380_460_000, trades=None)])
+    assert len(df) == 2  # trades는 핵심 열이 아니므로 행은 유지
+    assert df["trades"].dtype == pd.Int64Dtype()
+    assert df["trades"].iloc[0] == 7
+    assert df["trades"].isna().iloc[1]
+
+
+def test_missing_core_rows_dropped(monkeypatch):
+    # float 열은 "NaN"/null도 fromiter가 그대로 읽으므로(빠른 경로) 결측 행 제거를 확인
+    rows = [_row(1_704_380_400_000), _row(1_704_380_460_000, close=None), _row(1_704_380_520_000, close="NaN")]
+    df = _load(monkeypatch, rows)
+    assert len(df) == 1
+    assert df["trades"].dtype == np.int64
+
+
+def test_end_time_type_validated(monkeypatch):
+    monkeypatch.setattr(crypto, "setup_logging", lambda **kw: None)  # 로그 파일 생성 안 함
+    # start와 값은 같아도 타입이 다른 end_time은 거부
+    with pytest.raises(TypeError):
+        crypto.crypto_data_loader("BTCUSDT", "1m", 1_704_380_400_000, 1_704_380_400_000.0)
+
+
+def test_time_parser_rejects_iso_week_dates():
+    # fromisoformat 빠른 경로가 ISO 주 날짜를 받아들이지 않아야 함
+    for t in ("2024-W01-1", "2024-W01-1 12:30"):
+        with pytest.raises(ValueError):
+            crypto.time_parser(t)
+    assert crypto.time_parser("2024-01-05 12:30") == 1_704_425_400_000
+    assert crypto.time_parser("2024-01-05") == 1_704_380_400_000
+
+
+def _page(n=3, t0=1_704_380_400_000):
+    rows = [_row(t0 + 60_000 * i) for i in range(n)]
+    cols = list(zip(*rows))
+    return {name: np.asarray(cols[i], dtype=dt) for name, (i, dt) in crypto._KLINE_FIELDS.items()}
+
+
+def test_page_cache_round_trip(tmp_path):
+    page = _page()
+    path = str(tmp_path / "host" / "BTCUSDT" / "1m" / "p.npz")
+    crypto._save_cached_page(path, page)
+    loaded = crypto._load_cached_page(path)
+    assert loaded.keys() == page.keys()
+    for name in page:
+        assert loaded[name].dtype == page[name].dtype
+        np.testing.assert_array_equal(loaded[name], page[name])
+
+
+def test_corrupt_page_cache_is_refetched(tmp_path):
+    path = tmp_path / "bad.npz"
+    path.write_bytes(b"PK\x03\x04 truncated")
+    assert crypto._load_cached_page(str(path)) is None
+    assert not path.exists()  # 손상 파일은 삭제
+
+
+def test_only_full_pages_hit_disk(monkeypatch, tmp_path):
+    t0 = 1_704_380_400_000
+    monkeypatch.setattr(crypto, "_SESSION", _FakeSession([_row(t0), _row(t0 + 60_000)]))
+    monkeypatch.setattr(crypto, "_PAGE_CACHE_DIR", str(tmp_path))
+    crypto._fetch_closed_page.cache_clear()
+    try:
+        url = crypto._KLINES_URL["spot"]
+        # limit=3 구간 중 일부(end_time에서 잘린 마지막 페이지)는 저장 안 함
+        crypto._fetch_closed_page(url, "BTCUSDT", "1m", t0, t0 + 60_000 * 2 - 1, 3)
+        assert not list(tmp_path.rglob("*.npz"))
+        # limit개를 꽉 채운 구간은 저장
+        crypto._fetch_closed_page(url, "BTCUSDT", "1m", t0, t0 + 60_000 * 3 - 1, 3)
+        assert len(list(tmp_path.rglob("*.npz"))) == 1
+    finally:
+        crypto._fetch_closed_page.cache_clear()
+
+
+class _FakeClock:
+    # sleep하면 시계만 앞으로 감는 가짜 시계
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, s):
+        self.slept.append(s)
+        self.now += s
+
+
+def test_weight_bucket_waits_for_window():
+    clock = _FakeClock()
+    bucket = crypto._WeightBucket(capacity=2, window_s=60.0, clock=clock, sleep=clock.sleep)
+    bucket.take()
+    clock.now = 10.0
+    bucket.take()
+    assert clock.slept == []
+    # 창이 가득 참 → 가장 오래된 기록(t=0)이 빠지는 t=60까지 50초 대기
+    bucket.take()
+    assert clock.slept == [50.0]
+    assert bucket._used == 2
+
+
+def test_weight_bucket_sync_from_header():
+    clock = _FakeClock()
+    bucket = crypto._WeightBucket(capacity=5, window_s=60.0, clock=clock, sleep=clock.sleep)
+    bucket.take()
+    # 서버가 더 많이 썼다고 알려주면 그만큼 채움, 더 적게 알려주면 그대로
+    bucket.sync(5)
+    assert bucket._used == 5
+    bucket.sync(3)
+    assert bucket._used == 5
+    clock.now = 30.0
+    bucket.take()
+    assert clock.slept == [30.0]  # 보정된 사용량(t=0 기록)이 빠질 때까지 대기
+
+
+def test_buckets_are_per_host():
+    spot = crypto._bucket_for(crypto._KLINES_URL["spot"])
+    futures = crypto._bucket_for(crypto._KLINES_URL["futures"])
+    assert spot is not futures
+    assert crypto._bucket_for(crypto._KLINES_URL["spot"]) is spot
+
+
+def test_backoff_floor_after_zero_wait():
+    # Retry-After: 0 다음 백오프도 최소 대기(_BACKOFF_BASE) 이상
+    for _ in range(200):
+        assert crypto._BACKOFF_BASE <= crypto._backoff(0.0) <= crypto._BACKOFF_CAP
+
+
+class _ScriptedSession:
+    # 정해진 응답을 순서대로 돌려주는 세션
+    def __init__(self, responses):
+        self.responses = list(responses)
+
+    def get(self, url, params=None, timeout=None):
+        return self.responses.pop(0)
+
+
+def test_5xx_honours_retry_after(monkeypatch):
+    busy = _FakeResp([])
+    busy.status_code = 503
+    busy.headers = {"Retry-After": "2"}
+    ok = _FakeResp([_row(1_704_380_400_000)])
+    monkeypatch.setattr(crypto, "_SESSION", _ScriptedSession([busy, ok]))
+    slept = []
+    monkeypatch.setattr(crypto.time, "sleep", slept.append)
+    page = crypto.get_api_data_binance("https://example.invalid/api/v3/klines", {"symbol": "BTCUSDT"})
+    assert slept == [2.0]
+    assert len(page["open_time"]) == 1
+
+
+def test_418_honours_retry_after(monkeypatch):
+    banned = _FakeResp([])
+    banned.status_code = 418
+    banned.headers = {"Retry-After": "3"}
+    ok = _FakeResp([_row(1_704_380_400_000)])
+    monkeypatch.setattr(crypto, "_SESSION", _ScriptedSession([banned, ok]))
+    slept = []
+    monkeypatch.setattr(crypto.time, "sleep", slept.append)
+    page = crypto.get_api_data_binance("https://example.invalid/api/v3/klines", {"symbol": "BTCUSDT"})
+    assert slept == [3.0]  # RequestException 경로(즉시 재시도)로 빠지지 않음
+    assert len(page["open_time"]) == 1
+
+
+def test_long_retry_after_fails_without_early_retry(monkeypatch):
+    limited = _FakeResp([])
+    limited.status_code = 429
+    limited.headers = {"Retry-After": "120"}
+    session = _ScriptedSession([limited, _FakeResp([_row(1_704_380_400_000)])])
+    monkeypatch.setattr(crypto, "_SESSION", session)
+    slept = []
+    monkeypatch.setattr(crypto.time, "sleep", slept.append)
+    with pytest.raises(RuntimeError, match="Retry-After"):
+        crypto.get_api_data_binance("https://example.invalid/api/v3/klines", {"symbol": "BTCUSDT"})
+    assert slept == []
+    assert len(session.responses) == 1  # 재요청하지 않음
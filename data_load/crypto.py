@@ -5,20 +5,224 @@
             column(open, high, low, close, volume)
             가격, 거래량은 float64, 시간오름차순 정렬, 중복없음
 """
+import logging
+import os
+import numpy as np
 import pandas as pd
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
 from zoneinfo import ZoneInfo
-import requests, time, random
+import requests, time, random, threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from types import MappingProxyType
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+
+# JSON 디코더: orjson이 있으면 사용(대용량 kline 배열 파싱이 더 빠름), 없으면 표준 json
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # pragma: no cover - 선택 의존성
+    import json
+    _json_loads = json.loads
 
 # --- logging utils ---
-from utils.logging_config import get_logger, setup_logging
+from utils.logging_config import get_logger, setup_logging, safe_params
 from utils.logger import with_context, timeit, log_request
 
 log = with_context(get_logger(__name__), svc="crypto-loader", env="dev")
 
+KST = ZoneInfo("Asia/Seoul")
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_MS = timedelta(milliseconds=1)
+
+# market별 klines 엔드포인트(전체 URL을 미리 조합)
+_KLINES_URL = MappingProxyType({
+    "spot": "https://api.binance.com/api/v3/klines",
+    "futures": "https://fapi.binance.com/fapi/v1/klines",
+})
+
+# interval_ms = 인터벌 단위별 ms 단위 매핑(1M 제외)
+INTERVAL_MS = MappingProxyType({
+    "1m": 60_000,
+    "3m": 180_000,
+    "5m": 300_000,
+    "15m": 900_000,
+    "30m": 1_800_000,
+    "1h": 3_600_000,
+    "2h": 7_200_000,
+    "4h": 14_400_000,
+    "6h": 21_600_000,
+    "8h": 28_800_000,
+    "12h": 43_200_000,
+    "1d": 86_400_000,
+    "3d": 259_200_000,
+    "1w": 604_800_000,
+    # "1M": 달 단위는 달력 기준이라 고정 불가 → v0.3에서 별도 처리
+})
+# 허용 interval 집합(1M 삭제): 매핑의 키와 항상 일치하도록 파생
+ALLOWED = frozenset(INTERVAL_MS)
+
+# 페이지 배열 스키마: 열 이름 -> (kline 응답 내 위치, dtype)
+# open_time/close_time은 에포크 밀리초(int64) 그대로 들고 다니다가 최종 단계에서 변환
+_KLINE_FIELDS = {
+    "open_time": (0, np.int64),
+    "open": (1, np.float64),
+    "high": (2, np.float64),
+    "low": (3, np.float64),
+    "close": (4, np.float64),
+    "volume": (5, np.float64),
+    "close_time": (6, np.int64),
+    "quote_volume": (7, np.float64),
+    "trades": (8, np.int64),
+    "taker_buy_base": (9, np.float64),
+    "taker_buy_quote": (10, np.float64),
+}
+# 응답 앞쪽에서 읽을 열 개수(위치 0~10, 11번째 ignore 열은 읽지 않음)
+_N_FIELDS = len(_KLINE_FIELDS)
+
+# 빈 응답용 템플릿(모듈 로드 시 한 번만 생성)
+# 빈 페이지 배열은 읽기 전용으로 공유, 빈 DataFrame은 호출자가 수정할 수 있도록 copy해서 반환
+_EMPTY_PAGE = {name: np.empty(0, dtype=dt) for name, (_, dt) in _KLINE_FIELDS.items()}
+for _arr in _EMPTY_PAGE.values():
+    _arr.flags.writeable = False
+_EMPTY_DF = pd.DataFrame({
+    "open": pd.Series(dtype="float64"),
+    "high": pd.Series(dtype="float64"),
+    "low": pd.Series(dtype="float64"),
+    "close": pd.Series(dtype="float64"),
+    "volume": pd.Series(dtype="float64"),
+    "close_time": pd.Series(dtype="datetime64[ns, UTC]"),
+    "quote_volume": pd.Series(dtype="float64"),
+    "trades": pd.Series(dtype="int64"),
+    "taker_buy_base": pd.Series(dtype="float64"),
+    "taker_buy_quote": pd.Series(dtype="float64"),
+}, index=pd.DatetimeIndex([], tz=KST, name="open_time"))
+
+# 동시에 요청할 페이지 수(Binance 1200 weight/min 한도 내에서 안전한 수준)
+_MAX_WORKERS = 4
+
+# 모듈 전역 세션: 페이지마다 TCP/TLS 핸드셰이크를 다시 하지 않도록 커넥션 풀을 재사용
+# (재시도는 get_api_data_binance의 루프가 담당하므로 어댑터 재시도는 0)
+def _build_session() -> requests.Session:
+    s = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0)
+    s.mount("https://", adapter)
+    s.headers.update({"Accept-Encoding": "gzip", "User-Agent": "economy-lab/1.0"})
+    return s
+
+_SESSION = _build_session()
+
+def set_session(session: requests.Session) -> None:
+    """
+    모듈 전역 세션 교체(테스트용 목 세션 주입 등)
+    """
+    global _SESSION
+    _SESSION = session
+
+# -----------------------------------------------------------------------------
+# 클라이언트 측 레이트 리미터(Binance IP weight, 1분 창)
+# -----------------------------------------------------------------------------
+class _WeightBucket:
+    """
+    최근 window_s 초 동안 보낸 요청 weight 합이 capacity를 넘지 않도록 요청 전에 대기합니다.
+    - take(weight): 보내기 전에 호출, 창이 가득 차 있으면 가장 오래된 기록이 빠질 때까지 sleep(락은 놓고 대기)
+    - sync(used): 응답 헤더 X-MBX-USED-WEIGHT-1M(서버 기준 사용량)으로 로컬 사용량 보정
+    429/418(밴)을 맞고 백오프하는 대신 미리 속도를 맞추기 위함. 스레드 안전.
+    """
+
+    def __init__(self, capacity: int = 1100, window_s: float = 60.0, clock=None, sleep=None):
+        self.capacity = capacity
+        self.window_s = window_s
+        self._events: deque = deque()   # (monotonic 시각, weight)
+        self._used = 0
+        self._lock = threading.Lock()
+        # 시계/대기 함수 주입(테스트용 가짜 시계), 기본은 time.monotonic / time.sleep
+        self._clock = clock or time.monotonic
+        self._sleep = sleep or time.sleep
+
+    def _purge(self, now: float) -> None:
+        while self._events and now - self._events[0][0] >= self.window_s:
+            self._used -= self._events.popleft()[1]
+
+    def take(self, weight: int = 1) -> None:
+        while True:
+            # 대기 시간 계산/기록은 락 안에서만
+            with self._lock:
+                now = self._clock()
+                self._purge(now)
+                if self._used + weight <= self.capacity or not self._events:
+                    self._events.append((now, weight))
+                    self._used += weight
+                    return
+                wait = self.window_s - (now - self._events[0][0])
+                used = self._used
+            log.warning("rate_limit_wait", extra={"used": used, "wait_s": round(wait, 3)})
+            # 락을 놓고 대기: 그동안 다른 스레드의 sync()가 막히지 않음, 깨어나면 다시 검사
+            self._sleep(wait)
+
+    def sync(self, used: int) -> None:
+        with self._lock:
+            now = self._clock()
+            self._purge(now)
+            # 서버 사용량이 더 크면(다른 프로세스/요청 weight 차이) 차이만큼 채워 넣음
+            if used > self._used:
+                self._events.append((now, used - self._used))
+                self._used = used
+
+# 호스트별 버킷: spot(api.binance.com)과 futures(fapi.binance.com)는 IP weight 한도와
+# X-MBX-USED-WEIGHT-1M 카운터가 각각 따로이므로 한쪽의 sync가 다른 쪽을 막지 않도록 분리
+_BUCKETS: dict[str, _WeightBucket] = {}
+_BUCKETS_LOCK = threading.Lock()
+
+def _bucket_for(url: str) -> _WeightBucket:
+    host = urlsplit(url).netloc
+    bucket = _BUCKETS.get(host)
+    if bucket is None:
+        with _BUCKETS_LOCK:
+            bucket = _BUCKETS.setdefault(host, _WeightBucket())
+    return bucket
+# klines 요청 1회당 weight(실제 weight와 차이는 응답 헤더 동기화로 보정)
+_KLINES_WEIGHT = 1
+
+# -----------------------------------------------------------------------------
+# 재시도 백오프
+# -----------------------------------------------------------------------------
+_BACKOFF_BASE = 1.0   # 최소 대기(초)
+_BACKOFF_CAP = 30.0   # 최대 대기(초)
+
+def _backoff(prev: float, cap: float = _BACKOFF_CAP, base: float = _BACKOFF_BASE) -> float:
+    """
+    decorrelated jitter: [base, 직전 대기*3] 구간에서 무작위로 뽑고 cap으로 자름.
+    고정 지수 + 작은 지터보다 동시 재시도가 덜 겹침.
+    """
+    # 직전 대기가 base보다 작으면(Retry-After: 0 등) base 기준으로 계산해 하한을 지킴
+    return min(cap, random.uniform(base, max(prev, base) * 3))
+
+def _parse_retry_after(value: str | None) -> float | None:
+    """
+    Retry-After 헤더를 대기 초로 변환. RFC 7231은 정수 초와 HTTP-date 두 형식을 허용.
+    해석할 수 없으면 None.
+    """
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:  # HTTP-date는 GMT 기준
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
 # 시간 검증 유틸
 def time_parser(time: str | int): # 입력: YYYY-MM-DD HH:MM 또는 YYYY-MM-DD
-    KST = ZoneInfo("Asia/Seoul")
     # 타입 체크
     if isinstance(time, bool): # bool 타입이면 int로 인식될 수도 있음!
         raise TypeError("time must not be bool")
@@ -30,145 +234,218 @@ def time_parser(time: str | int): # 입력: YYYY-MM-DD HH:MM 또는 YYYY-MM-DD
         return time
     if not isinstance(time, str): # 타입이 str, int 모두 아닌 경우
         raise TypeError(f"time must be str or int(ms), got {type(time).__name__}")
+    # 문자열 파싱은 캐시된 경로로 위임(같은 날짜 문자열 반복 호출 대비)
+    return _parse_str(time)
+
+@lru_cache(maxsize=4096)
+def _parse_str(time: str) -> int:
     # 문자열 정리 및 형식 보완
     t = time.strip()
     if len(t) == 10: # YYYY-MM-DD인 경우 길이가 10
         t = t + " 00:00"
     # KST로 해석, UTC로 변환
-    try:
-        dt = datetime.strptime(t, "%Y-%m-%d %H:%M")
-    except ValueError as e:
-        raise ValueError(f"invalid datetime: {t!r} (expected 'YYYY-MM-DD[ HH:MM]')") from e
+    # 정확히 'YYYY-MM-DD HH:MM' 모양이면 C 구현인 fromisoformat 사용
+    # (fromisoformat은 초/오프셋/ISO 주 날짜 등도 받으므로 구분자 위치가 다르면 기존 strptime 규칙으로 검증)
+    dt = None
+    if len(t) == 16 and t[4] == "-" and t[7] == "-" and t[10] == " " and t[13] == ":":
+        try:
+            dt = datetime.fromisoformat(t)
+        except ValueError:
+            pass  # ' 5'처럼 strptime만 받는 형태는 아래에서 판정
+    if dt is None:
+        try:
+            dt = datetime.strptime(t, "%Y-%m-%d %H:%M")
+        except ValueError as e:
+            raise ValueError(f"invalid datetime: {t!r} (expected 'YYYY-MM-DD[ HH:MM]')") from e
     dt = dt.replace(tzinfo=KST)
-    # 에포크 밀리초로 변환
-    return int(dt.astimezone(timezone.utc).timestamp()*1000)
+    # 에포크 밀리초로 변환(aware datetime 차이를 정수 나눗셈: astimezone/float 변환 없음)
+    return (dt - _EPOCH_UTC) // _ONE_MS
+
+# 에포크 밀리초(int64) → KST DatetimeIndex
+# 정수 곱 후 datetime64[ns]로 view(to_datetime 파싱 생략), UTC 지정 후 KST로 변환
+# (tz-aware 인덱스는 내부적으로 UTC 값을 저장하므로 tz_convert는 값 복사 없이 tz 정보만 교체)
+def _ms_to_kst(ms: np.ndarray, name: str | None = None) -> pd.DatetimeIndex:
+    naive = pd.DatetimeIndex((ms * 1_000_000).view("datetime64[ns]"), name=name)
+    return naive.tz_localize("UTC").tz_convert(KST)
+
+# 숫자로 읽히지 않는 값이 섞인 페이지 처리(느린 경로)
+# trades에 결측/비숫자가 있으면 float64(NaN)로 들고 다니다가 pagination에서 Int64로 변환
+def _coerce_page(cols) -> dict:
+    page = {}
+    for name, (i, dt) in _KLINE_FIELDS.items():
+        if dt is np.float64 or name == "trades":
+            arr = pd.to_numeric(pd.Series(cols[i]), errors="coerce").to_numpy(dtype=np.float64)
+            if name == "trades" and not np.isnan(arr).any():
+                arr = arr.astype(np.int64)
+            page[name] = arr
+        else:
+            page[name] = np.asarray(cols[i], dtype=dt)
+    return _drop_missing_core(page)
+
+# 핵심 열(open/high/low/close/volume) 중 하나라도 결측(NaN)인 행 제거
+# 결측이 없으면(대부분) 원본 페이지를 그대로 반환
+def _drop_missing_core(page: dict) -> dict:
+    na_mask = np.isnan(page["open"])
+    for name in ("high", "low", "close", "volume"):
+        na_mask |= np.isnan(page[name])
+    if na_mask.any():
+        page = {name: arr[~na_mask] for name, arr in page.items()}
+    return page
 
 # request를 통해 Binance api와 연결
-def get_api_data_binance(base_url: str, path: str, params: dict,
+def get_api_data_binance(url: str, params: dict,
                           timeout: float = 10.0, max_retries: int = 3):
-    # url 조합
-    url = base_url.rstrip("/") + "/" + path.lstrip("/")
-    with requests.Session() as s:
-        for attempt in range(max_retries+1):
-            try:
-                # 파라미터 정보 로그에 저장
-                log_request(log, "GET", url, params=params, level="DEBUG")
-                # 요청 전송
-                r = s.get(url, params=params, timeout=timeout)
-                # 받은 요청 확인
-                # status_code == 429 -> 레이트리밋
-                if r.status_code == 429:
-                    retry_after = r.headers.get("Retry-After")
-                    if retry_after is not None:
-                        try:
-                            wait = float(retry_after)
-                        except ValueError:
-                            wait = 2 ** attempt + random.uniform(0,0.25)
-                    else:
-                        wait = 2 ** attempt + random.uniform(0,0.25)
-                    # 에러 로깅 적용
-                    log_request(log, "GET", url, status=429, attempt=attempt, wait_s=wait, level="WARNING")
+    # 직전 대기 시간(decorrelated jitter 계산용)
+    wait = _BACKOFF_BASE
+    # DEBUG 로그 여부와 마스킹된 params는 재시도마다 다시 계산하지 않음
+    debug = log.isEnabledFor(logging.DEBUG)
+    masked_params = safe_params(params) if debug else None
+    # 요청 호스트(spot/futures)의 weight 버킷
+    bucket = _bucket_for(url)
+    for attempt in range(max_retries+1):
+        try:
+            # 파라미터 정보 로그에 저장(DEBUG 꺼져 있으면 payload 구성 생략)
+            if debug:
+                log_request(log, "GET", url, params_masked=masked_params, level="DEBUG")
+            # 요청 전송(레이트 리밋 창이 가득 차 있으면 먼저 대기)
+            bucket.take(_KLINES_WEIGHT)
+            r = _SESSION.get(url, params=params, timeout=timeout)
+            # 서버 기준 사용 weight로 리미터 동기화
+            used_weight = r.headers.get("X-MBX-USED-WEIGHT-1M")
+            if used_weight is not None and used_weight.isdigit():
+                bucket.sync(int(used_weight))
+            # 받은 요청 확인
+            # status_code == 429 -> 레이트리밋, 418 -> 429를 무시하고 계속 요청해 IP 차단됨
+            # 500 <= status_code < 600 -> server error(503 등은 Retry-After를 보내는 경우가 많음)
+            if r.status_code in (418, 429) or 500 <= r.status_code < 600:
+                # Retry-After(초 또는 HTTP-date)가 있으면 그대로 따르고, 없으면 decorrelated jitter
+                retry_after = _parse_retry_after(r.headers.get("Retry-After"))
+                if retry_after is not None and retry_after > _BACKOFF_CAP:
+                    # 서버가 요구한 시간보다 일찍 재시도하면 차단(418)이 길어지므로 재시도하지 않고 실패 처리
+                    log_request(log, "GET", url, status=r.status_code, attempt=attempt,
+                                wait_s=retry_after, level="ERROR")
+                    raise RuntimeError(f"API 요청 실패: HTTP {r.status_code}, Retry-After {retry_after:.0f}s "
+                                       f"(url={url}, params={params})")
+                wait = retry_after if retry_after is not None else _backoff(wait)
+                # 에러 로깅 적용
+                log_request(log, "GET", url, status=r.status_code, attempt=attempt, wait_s=wait, level="WARNING")
+                # 마지막 시도였다면 대기 없이 루프 종료 후 실패 처리
+                if attempt < max_retries:
                     time.sleep(wait)
-                    continue
-                # 500 <= status_code < 600 -> server error
-                elif 500 <= r.status_code < 600:
-                    wait = 2 ** attempt + random.uniform(0,0.25)
-                    # 에러 로깅 적용
-                    log_request(log, "GET", url, status=r.status_code, attempt=attempt, wait_s=wait, level="WARNING")
-                    time.sleep(wait)
-                    continue
-                else:
-                    r.raise_for_status()
-                    # json 형태로 데이터 받기
-                    data = r.json()
-                    # 데이터 수집 성공 시 로깅
+                continue
+            else:
+                r.raise_for_status()
+                # json 형태로 데이터 받기
+                data = _json_loads(r.content)
+                # 데이터 수집 성공 시 로깅
+                if debug:
                     log_request(log, "GET", url, status=r.status_code,
-                                note=f"rows={0 if data == [] else len(data)}", level="DEBUG")
-                    # 빈 데이터프레임일 시
-                    if data == []:
-                        empty_idx = pd.DatetimeIndex([], tz="Asia/Seoul", name="open_time")
-                        empty_df = pd.DataFrame({
-                            "open": pd.Series(dtype="float64"),
-                            "high": pd.Series(dtype="float64"),
-                            "low": pd.Series(dtype="float64"),
-                            "close": pd.Series(dtype="float64"),
-                            "volume": pd.Series(dtype="float64"),
-                            "close_time": pd.Series(dtype="datetime64[ns, UTC]"),
-                            "quote_volume": pd.Series(dtype="float64"),
-                            "trades": pd.Series(dtype="Int64"),
-                            "taker_buy_base": pd.Series(dtype="float64"),
-                            "taker_buy_quote": pd.Series(dtype="float64"),
-                        }, index=empty_idx)
-                        return empty_df
-                    else:
-                        # 데이터프레임 만들기
-                        COLUMNS = [
-                            "open_time", "open", "high", "low", "close", "volume",
-                            "close_time", "quote_volume", "trades", 
-                            "taker_buy_base", "taker_buy_quote", "ignore"
-                        ]
-                        df = pd.DataFrame(data, columns=COLUMNS)
-                        # 필요없는 열 제거
-                        df = df.drop(columns=["ignore"])
-                        # 데이터 타입 변환
-                        NUMERIC_FLOAT = ["open", "high", "low", "close", "volume", "quote_volume", "taker_buy_base", "taker_buy_quote"]
-                        df[NUMERIC_FLOAT] = df[NUMERIC_FLOAT].apply(pd.to_numeric, errors = "coerce")
-                        df["trades"] = pd.to_numeric(df["trades"], errors="coerce").astype("Int64")
-                        # 에포크 밀리초를 타임스템프(UTC)로 변환
-                        df["open_time"]  = pd.to_datetime(df["open_time"], unit="ms", utc=True)
-                        df["close_time"] = pd.to_datetime(df["close_time"], unit="ms", utc=True)
-                        # open_time을 기준으로 정렬
-                        df = df.set_index("open_time").sort_index()
-                        df = df[~df.index.duplicated(keep="last")]
-                        # 결측값 수 파악
-                        na_count = df.isna().sum()
-                        # 핵심 열의 결측값 제거
-                        df = df.dropna(subset=["open","high","low","close","volume"])
-                        return df
-
-            except requests.exceptions.RequestException as e:
-                # 최종 실패 직전 로그
-                if attempt >= max_retries:
-                    log.error("request_exception_final", exc_info=True,
-                              extra={"url": url, "params": params})
-                    raise RuntimeError(f"API 요청 실패: {e} (url={url}, params={params})")
-                else:
-                    log.warning("request_exception_retry", extra={"attempt": attempt, "err": repr(e)})
-            except ValueError as e:
-                log.error("json_parse_error", exc_info=True, extra={"url": url})
-                raise RuntimeError(f"JSON 파싱 실패: {e}")
-
-def pagination(Base_URL, path, symbol, interval, st, et, limit):
+                                note=f"rows={len(data)}", level="DEBUG")
+                # 빈 응답일 시 길이 0 배열 반환
+                if data == []:
+                    return _EMPTY_PAGE
+                # 행 단위 리스트를 열 단위로 한 번만 전치
+                # zip은 열 튜플을 지연 생성하므로 필요한 앞쪽 열까지만 만들고 ignore(마지막 열)는 건너뜀
+                cols = list(islice(zip(*data), _N_FIELDS))
+                # 열별로 NumPy에서 바로 타입 변환(데이터프레임은 pagination에서 한 번만 생성)
+                # fromiter(count 지정)는 열당 한 번만 할당하며 문자열 → float 변환을 C 루프에서 처리
+                # (정수 열에 null이 오면 TypeError, 비숫자 문자열이면 ValueError → 느린 경로)
+                n = len(data)
+                try:
+                    page = {name: np.fromiter(cols[i], dtype=dt, count=n) for name, (i, dt) in _KLINE_FIELDS.items()}
+                except (ValueError, TypeError):
+                    log.warning("kline_coerce_fallback", extra={"rows": len(data)})
+                    return _coerce_page(cols)
+                # float 열은 "NaN"/null도 오류 없이 NaN으로 읽으므로 핵심 열 결측 검사는 항상 수행
+                return _drop_missing_core(page)
+
+        except requests.exceptions.RequestException as e:
+            # 최종 실패 직전 로그
+            if attempt >= max_retries:
+                log.error("request_exception_final", exc_info=True,
+                          extra={"url": url, "params": params})
+                raise RuntimeError(f"API 요청 실패: {e} (url={url}, params={params})")
+            else:
+                log.warning("request_exception_retry", extra={"attempt": attempt, "err": repr(e)})
+        except ValueError as e:
+            log.error("json_parse_error", exc_info=True, extra={"url": url})
+            raise RuntimeError(f"JSON 파싱 실패: {e}")
+    # 418/429/5xx로 재시도를 모두 소진한 경우
+    log.error("retries_exhausted", extra={"url": url, "params": params, "max_retries": max_retries})
+    raise RuntimeError(f"API 요청 실패: 재시도 {max_retries}회 초과 (url={url}, params={params})")
+
+# -----------------------------------------------------------------------------
+# 과거 페이지 캐시
+# -----------------------------------------------------------------------------
+# 디스크 캐시는 opt-in: CRYPTO_PAGE_CACHE_DIR를 지정했을 때만 사용(미지정/빈 문자열이면 비활성화)
+# 상대 경로는 실행 위치(CWD)가 아니라 저장소 루트 기준으로 해석(예: "data/cache/binance" → .gitignore 대상)
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_PAGE_CACHE_DIR = os.getenv("CRYPTO_PAGE_CACHE_DIR", "")
+if _PAGE_CACHE_DIR:
+    _PAGE_CACHE_DIR = os.path.join(_REPO_ROOT, _PAGE_CACHE_DIR)
+
+def _page_cache_path(url, symbol, interval, start_ms, end_ms, limit) -> str:
+    # spot/futures가 섞이지 않도록 호스트를 경로에 포함
+    host = urlsplit(url).netloc
+    return os.path.join(_PAGE_CACHE_DIR, host, symbol, interval, f"{start_ms}_{end_ms}_{limit}.npz")
+
+def _load_cached_page(path: str) -> dict | None:
+    try:
+        with np.load(path) as f:
+            return {name: f[name] for name in _KLINE_FIELDS}
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # 손상/잘린 파일(BadZipFile, EOFError 등)은 지우고 다시 받음
+        log.warning("page_cache_corrupt", exc_info=True, extra={"path": path})
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return None
+
+def _save_cached_page(path: str, page: dict) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # 스레드/프로세스가 동시에 써도 반쯤 쓴 파일이 보이지 않도록 임시 파일 후 교체
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        np.savez(f, **page)
+    os.replace(tmp, path)
+
+# 모든 캔들이 닫힌 과거 페이지는 불변이므로
+# 1) 메모리 LRU 캐시(같은 프로세스 내 반복 호출), 2) 디스크 캐시(실행 간 재사용)로 재사용
+@lru_cache(maxsize=512)
+def _fetch_closed_page(url, symbol, interval, start_ms, end_ms, limit):
+    path = _page_cache_path(url, symbol, interval, start_ms, end_ms, limit) if _PAGE_CACHE_DIR else None
+    page = _load_cached_page(path) if path else None
+    if page is None:
+        params = {"symbol":symbol, "interval":interval, "startTime":start_ms,
+                  "endTime":end_ms, "limit":limit}
+        page = get_api_data_binance(url, params=params)
+        # 디스크에는 limit개 캔들 구간을 꽉 채운 페이지만 저장
+        # (end_time마다 달라지는 마지막 부분 페이지, 빈 페이지는 남기지 않아 캐시가 무한정 늘지 않게 함)
+        full = end_ms - start_ms + 1 == limit * INTERVAL_MS[interval]
+        if path and full and len(page["open_time"]):
+            try:
+                _save_cached_page(path, page)
+            except OSError:
+                log.warning("page_cache_write_failed", exc_info=True, extra={"path": path})
+    # 캐시된 배열은 호출 간에 공유되므로 읽기 전용으로 고정
+    for arr in page.values():
+        arr.flags.writeable = False
+    return page
+
+def pagination(url, symbol, interval, st, et, limit):
     # limit 숫자 지정
     if limit is None:
         limit = 1000
-    # interval_ms = 인터벌 단위별 ms 단위로 매핑 필요(1M 제외)
-    INTERVAL_MS_Group = {
-        "1m": 60 * 1000,
-        "3m": 3 * 60 * 1000,
-        "5m": 5 * 60 * 1000,
-        "15m": 15 * 60 * 1000,
-        "30m": 30 * 60 * 1000,
-        "1h": 60 * 60 * 1000,
-        "2h": 2 * 60 * 60 * 1000,
-        "4h": 4 * 60 * 60 * 1000,
-        "6h": 6 * 60 * 60 * 1000,
-        "8h": 8 * 60 * 60 * 1000,
-        "12h": 12 * 60 * 60 * 1000,
-        "1d": 24 * 60 * 60 * 1000,
-        "3d": 3 * 24 * 60 * 60 * 1000,
-        "1w": 7 * 24 * 60 * 60 * 1000,
-        # "1M": 달 단위는 달력 기준이라 고정 불가 → v0.3에서 별도 처리
-    }
-        # 1M은 달력 경계가 필요
-    interval_ms = INTERVAL_MS_Group[interval]
+    # 1M은 달력 경계가 필요
+    interval_ms = INTERVAL_MS[interval]
     # 페이지 시작과 끝 계산(interval_ms 활용)
     first = ((st + interval_ms - 1) // interval_ms) * interval_ms
     last = (et // interval_ms) * interval_ms
     # 기대 행수 계산(총 몇개의 행이 나올지)
     expected_rows = 0 if last < first else ((last - first) // interval_ms)+ 1
-    # 디버깅용 프린트문
-    print(f"총 {expected_rows}개의 행 데이터가 수집됩니다.")
     # 필요한 페이지 수 계산
     num_pages = 0 if expected_rows == 0 else (expected_rows + limit - 1) // limit
     # 페이지네이션 시작 시 로깅
@@ -177,67 +454,64 @@ def pagination(Base_URL, path, symbol, interval, st, et, limit):
         "first": first, "last": last, "k": interval_ms,
         "page_limit": limit, "expected_rows": expected_rows
     })
-    # 루프 실행
-    current = first
+    # 페이지 경계를 미리 계산(interval_ms, limit이 고정이므로 커서 없이도 결정됨)
+    span = limit * interval_ms
+    page_starts = [first + i * span for i in range(num_pages)]
+    # 한 페이지 요청(스레드 풀에서 실행)
+    now_ms = int(time.time() * 1000)
+    def fetch_page(page_start):
+        page_end = min(page_start + span - 1, et)
+        # 마지막 캔들이 닫히고 한 캔들 이상 지난 과거 페이지만 캐시 경로로
+        # (현재 진행 중인 구간은 캐시하지 않음)
+        if page_end + 2 * interval_ms < now_ms:
+            return _fetch_closed_page(url, symbol, interval, page_start, page_end, limit)
+        params = {"symbol":symbol, "interval":interval, "startTime":page_start,
+                  "endTime":page_end, "limit":limit}
+        return get_api_data_binance(url, params=params)
+    # 페이지 병렬 요청(네트워크 대기 위주라 GIL 영향 없음), map은 입력 순서를 유지
     frames = []
-    while current <= et:
-        # start_time과 end_time을 설정
-        startTime = current
-        endTime = et
-        # 파라미터 지정
-        params = {"symbol":symbol, "interval":interval, "startTime":startTime, "endTime":endTime, "limit":limit}
-        # requests 통해서 데이터 받아오기
-        result = get_api_data_binance(Base_URL, path=path, params=params)
-        # 빈 응답이 돌아오면 로깅 후 break
-        if result.empty:
-            log.info("paginate_empty_page", extra={"current": current})
-            break
-        # 최종 데이터에 병합
-        frames.append(result)
-        # 응답 마지막 캔들의 last_open 확인
-        last_open = int(result.index[-1].timestamp() * 1000)
-        # last_open <= current면 예외처리
-        if last_open <= current:
-            # 페이지네이션 문제 발생 시 로깅 후 에러처리
-            log.error("pagination_stalled", extra={
-                "current": current, "last_open_ms": last_open, "k": interval_ms,
-                "received_rows": len(result)
-            })
-            raise RuntimeError("pagination stalled: last_open_ms <= current")
-        # 다음 시작점 설정
-        current = last_open + interval_ms
-        # current > end_ms이면 break
-        if current > et:
-            break
+    with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as ex:
+        for page_start, result in zip(page_starts, ex.map(fetch_page, page_starts)):
+            # 빈 응답(거래 중단 구간 등)은 로깅 후 건너뜀
+            if len(result["open_time"]) == 0:
+                log.info("paginate_empty_page", extra={"current": page_start})
+                continue
+            # 응답 마지막 캔들의 last_open 확인
+            last_open = int(result["open_time"][-1])
+            # 요청한 구간보다 앞선 캔들만 돌아오면 예외처리
+            if last_open < page_start:
+                # 페이지네이션 문제 발생 시 로깅 후 에러처리
+                log.error("pagination_stalled", extra={
+                    "current": page_start, "last_open_ms": last_open, "k": interval_ms,
+                    "received_rows": len(result["open_time"])
+                })
+                raise RuntimeError("pagination stalled: last_open_ms < page_start")
+            # 최종 데이터에 병합
+            frames.append(result)
     # 첫 페이지부터 빈 응답인 경우
     if not frames:
-        empty_idx = pd.DatetimeIndex([], tz="Asia/Seoul", name="open_time")
-        empty_df = pd.DataFrame({
-            "open": pd.Series(dtype="float64"),
-            "high": pd.Series(dtype="float64"),
-            "low": pd.Series(dtype="float64"),
-            "close": pd.Series(dtype="float64"),
-            "volume": pd.Series(dtype="float64"),
-            "close_time": pd.Series(dtype="datetime64[ns, UTC]"),
-            "quote_volume": pd.Series(dtype="float64"),
-            "trades": pd.Series(dtype="Int64"),
-            "taker_buy_base": pd.Series(dtype="float64"),
-            "taker_buy_quote": pd.Series(dtype="float64"),
-        }, index=empty_idx)
         # 빈 응답 로깅
         log.info("paginate_end", extra={"req_count": 0, "rows": 0})
-        return empty_df
-    # 최종 데이터 정리
-    frames = pd.concat(frames, axis=0).sort_index()
-    frames = frames[~frames.index.duplicated(keep="last")]
-    # 종료 시간(타임스템프형태) 반환
-    end_utc = pd.to_datetime(et, unit="ms", utc=True)
-    # 종료 시간까지의 데이터만 저장
-    frames = frames.loc[frames.index <= end_utc]
-    # 반환 직전에 다시 KTC로 변환
-    KST = ZoneInfo("Asia/Seoul")
-    frames.index = frames.index.tz_convert(KST)                # open_time → KST
-    frames["close_time"] = frames["close_time"].dt.tz_convert(KST)
+        return _EMPTY_DF.copy()
+    # 최종 데이터 정리: 열별 배열을 한 번에 이어붙이기
+    cols = {name: np.concatenate([page[name] for page in frames]) for name in _KLINE_FIELDS}
+    # 페이지는 이미 오름차순이고 구간이 겹치지 않으므로 보통은 단조 증가
+    # 단조 증가가 깨진 경우에만 open_time 기준 정렬 + 중복 제거(같은 open_time은 마지막 값 유지)
+    open_ms = cols["open_time"]
+    if not (np.diff(open_ms) > 0).all():
+        _, rev_idx = np.unique(open_ms[::-1], return_index=True)
+        keep = len(open_ms) - 1 - rev_idx
+        cols = {name: arr[keep] for name, arr in cols.items()}
+    # 종료 시간까지의 데이터만 저장(정렬되어 있으므로 이진 탐색 후 슬라이스)
+    end_pos = int(np.searchsorted(cols["open_time"], et, side="right"))
+    cols = {name: arr[:end_pos] for name, arr in cols.items()}
+    # 데이터프레임은 여기서 한 번만 생성(시간 열은 생성 전에 KST로 변환해 사후 열 교체를 피함)
+    open_time = _ms_to_kst(cols.pop("open_time"), name="open_time")
+    cols["close_time"] = _ms_to_kst(cols["close_time"])
+    # trades 결측이 섞인 페이지가 있었으면(float64로 합쳐짐) nullable Int64로 변환
+    if cols["trades"].dtype.kind == "f":
+        cols["trades"] = pd.array(cols["trades"], dtype="Int64")
+    frames = pd.DataFrame(cols, index=open_time)
     # 행 수 체크 로깅
     log.info("paginate_end", extra={
         "req_count": len(frames),
@@ -275,47 +549,41 @@ def crypto_data_loader(
         json_format=False,                 # 프로덕션 수집/분석은 True
         rotate=True,                       # 로그 파일 회전 활성화
     )
-    # Base URL 정의
-    if market == "spot":
-        Base_URL = "https://api.binance.com"
-        path = "/api/v3/klines"
-    elif market == "futures":
-        Base_URL = "https://fapi.binance.com"
-        path = "/fapi/v1/klines"
-    else:
+    # 파라미터 검증: 값싼 검사(market → interval → limit)부터 하고 시간 파싱은 마지막에
+    # market에 맞는 klines 엔드포인트 선택
+    url = _KLINES_URL.get(market)
+    if url is None:
         # 현물/선물 설정 에러 로깅
         log.error("invalid_market", extra={"market": market})
         raise ValueError(f"market must be 'spot' or 'futures', got {market!r}")
-    # 파라미터 검증
     # interval이 유효한지(지정된 문자열 중 하나인지)
-    ALLOWED = {"1m","3m","5m","15m","30m","1h","2h","4h","6h","8h","12h","1d","3d","1w"} # 1M 삭제
     if interval not in ALLOWED:
         # 인터벌 에러 로깅
         log.error("invalid_interval", extra={"interval": interval})
         raise ValueError(f"interval must be one of {sorted(ALLOWED)}, got '{interval}'")
-    # 시간 검증
-    if start_time is not None and end_time is not None:
-        st = time_parser(start_time)
-        et = time_parser(end_time)
-        if st > et:
-            # 시간 설정 오류 로깅
-            log.error("invalid_time_range", extra={"st": st, "et": et})
-            raise ValueError(f"start time can't be later than end time. start time:'{start_time}', end time:'{end_time}'")
-    else:
-        # time error 로깅
-        log.error("time_none", extra={"start_time": start_time, "end_time": end_time})
-        raise ValueError(f"start time and end time can't be None, got start_time:'{start_time}', end_time:'{end_time}'")
     # limit가 1 이상인지
     if limit is not None and (limit < 1 or limit > 1000):
         # limit 에러 로깅
         log.error("invalid_limit", extra={"limit": limit})
         raise ValueError(f"limit can't be less than 1, more than 1000, got '{limit}'")
+    # 시간 검증
+    if start_time is None or end_time is None:
+        # time error 로깅
+        log.error("time_none", extra={"start_time": start_time, "end_time": end_time})
+        raise ValueError(f"start time and end time can't be None, got start_time:'{start_time}', end_time:'{end_time}'")
+    # end_time도 항상 time_parser로 타입 검증(문자열 경로는 lru_cache라 재파싱 비용이 작음)
+    st = time_parser(start_time)
+    et = time_parser(end_time)
+    if st > et:
+        # 시간 설정 오류 로깅
+        log.error("invalid_time_range", extra={"st": st, "et": et})
+        raise ValueError(f"start time can't be later than end time. start time:'{start_time}', end time:'{end_time}'")
     # 로딩 시작 로깅
     log.info("load_begin", extra={
         "symbol": symbol, "interval": interval, "market": market,
         "st": st, "et": et, "limit": limit or 1000
     })
-    result = pagination(Base_URL=Base_URL, path=path, symbol=symbol, interval=interval, st=st, et=et, limit=limit)
+    result = pagination(url=url, symbol=symbol, interval=interval, st=st, et=et, limit=limit)
     # 페이지네이션 이후 로깅
     log.info("load_done", extra={"rows": len(result), "first": str(result.index[:1]), "last": str(result.index[-1:])})
     # 반환
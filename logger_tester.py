@@ -19,3 +19,83 @@ def test_context_binding(caplog):
     # caplog.text 에 'svc=unittest' 또는 JSON ctx에 포함되어야 함
     assert "unittest" in caplog.text
     assert "req_id" in caplog.text
+
+def test_timeit_level_enabled_inside_call(caplog):
+    # 데코레이트된 함수 안에서 레벨이 켜져도(setup_logging 호출 등) done 로그가 남아야 함
+    from utils.logger import timeit
+    log = with_context(get_logger("timeit_test"), svc="unittest")
+    root = logging.getLogger()
+    prev = root.level
+    root.setLevel(logging.WARNING)
+
+    @timeit(log, "job")
+    def job():
+        root.setLevel(logging.INFO)
+
+    try:
+        job()
+    finally:
+        root.setLevel(prev)
+    assert any(r.getMessage() == "job done" for r in caplog.records)
+
+def _json_record(msg):
+    return logging.LogRecord("t", logging.INFO, __file__, 1, msg, None, None)
+
+def test_json_bytes_handler_encoding_and_order():
+    import io
+    from utils.logging_config import JSONBytesStreamHandler, JSONFormatter
+    # UTF-8 스트림: 텍스트 계층에 남은 쓰기가 JSON 줄보다 먼저 나와야 함
+    raw = io.BytesIO()
+    stream = io.TextIOWrapper(raw, encoding="utf-8")
+    h = JSONBytesStreamHandler(stream)
+    h.setFormatter(JSONFormatter())
+    stream.write("prefix-")
+    h.emit(_json_record("한글"))
+    assert raw.getvalue().decode("utf-8").startswith("prefix-{")
+    # cp949 스트림: bytes 경로를 쓰지 않고 스트림 인코딩을 따름
+    raw = io.BytesIO()
+    stream = io.TextIOWrapper(raw, encoding="cp949")
+    h = JSONBytesStreamHandler(stream)
+    h.setFormatter(JSONFormatter())
+    h.emit(_json_record("한글"))
+    assert "한글" in raw.getvalue().decode("cp949")
+
+def test_safe_params_returns_copy():
+    from utils.logging_config import safe_params
+    p = {"offset": 0}
+    masked = safe_params(p)
+    p["offset"] = 1000
+    assert masked == {"offset": 0}
+
+def test_json_formatter_non_str_ctx_keys():
+    import json
+    from utils.logging_config import JSONFormatter
+    rec = _json_record("m")
+    rec.ctx = {1: "a"}
+    fmt = JSONFormatter()
+    assert json.loads(fmt.format(rec))["ctx"] == {"1": "a"}
+    assert json.loads(fmt.format_bytes(rec))["ctx"] == {"1": "a"}
+
+def test_sample_rate_env_parsing(monkeypatch):
+    from utils.logger import _sample_rate_from_env
+    for raw, want in [("abc", 1.0), ("nan", 1.0), ("5", 1.0), ("-1", 0.0), ("0.25", 0.25)]:
+        monkeypatch.setenv("HTTP_LOG_SAMPLE", raw)
+        assert _sample_rate_from_env("HTTP_LOG_SAMPLE") == want
+
+def test_log_request_sampling_rule(monkeypatch, caplog):
+    import utils.logger as ul
+    from utils.logger import log_request
+    monkeypatch.setattr(ul, "_HTTP_SUCCESS_SAMPLE_RATE", 0.0)
+    log = get_logger("sampling_test")
+    url = "https://example.invalid"
+    with caplog.at_level(logging.DEBUG):
+        # 정상 응답(INFO, 2xx, 재시도 없음, note 없음/"ok")은 버림
+        log_request(log, "GET", url, status=200)
+        log_request(log, "GET", url, status=204, attempt=0, note="ok")
+        assert not caplog.records
+        # 오류/재시도/INFO 외 레벨/다른 note는 항상 남김
+        log_request(log, "GET", url, status=429)
+        log_request(log, "GET", url, status=200, attempt=1)
+        log_request(log, "GET", url, status=200, level="DEBUG")
+        log_request(log, "GET", url, status=200, note="rows=0")
+    assert len(caplog.records) == 4
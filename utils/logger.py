@@ -4,9 +4,9 @@ logger.py
 로깅 유틸리티 모음.
 
 핵심 기능
-- ContextAdapter / with_context(): 모든 로그에 공통 컨텍스트(ctx) 자동 부착
+- ContextAdapter / with_context(): 모든 로그에 공통 컨텍스트(ctx) 자동 부착(kwargs 또는 미리 만든 dict)
 - timeit(): 함수 실행시간(ms) 로깅 데코레이터(성공/실패 여부 포함)
-- log_request(): 외부 API 호출 요약(메서드/URL/상태/재시도/대기시간 등)
+- log_request(): 외부 API 호출 요약(메서드/URL/상태/재시도/대기시간 등, 정상 응답은 HTTP_LOG_SAMPLE로 샘플링)
 - sampled(): 샘플링 로깅(고트래픽 환경에서 로그량 제어)
 
 설계 포인트
@@ -18,9 +18,11 @@ logger.py
 from __future__ import annotations
 
 import logging
+import os
 import random
 import time
-from typing import Any, Dict, Optional, Callable, TypeVar
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Callable, TypeVar
 
 # Python 3.10+는 typing.ParamSpec, 그 이하 버전은 typing_extensions 사용
 try:
@@ -28,11 +30,33 @@ try:
 except ImportError:  # pragma: no cover - 구버전 호환
     from typing_extensions import ParamSpec  # type: ignore
 
-from .logging_config import safe_params
+from .logging_config import _resolve_level, safe_params
 
 P = ParamSpec("P")
 T = TypeVar("T")
 
+# sampled() 핫패스에서 모듈 속성 조회를 줄이기 위한 바인딩
+_rand = random.random
+
+
+def _sample_rate_from_env(name: str, default: float = 1.0) -> float:
+    """
+    환경변수에서 샘플링 비율을 읽어 [0, 1]로 자릅니다.
+    잘못된 값이어도 import가 깨지지 않도록 기본값으로 대체합니다.
+    """
+    try:
+        rate = float(os.getenv(name, default))
+    except ValueError:
+        return default
+    if rate != rate:  # NaN
+        return default
+    return max(0.0, min(1.0, rate))
+
+
+# log_request(): 정상 응답(2xx, 재시도 없음, INFO) 로그를 남길 비율(0.0~1.0)
+# 오류/재시도/INFO 외 레벨 로그는 항상 남긴다. 기본 1.0 = 샘플링 안 함
+_HTTP_SUCCESS_SAMPLE_RATE = _sample_rate_from_env("HTTP_LOG_SAMPLE")
+
 
 # -----------------------------------------------------------------------------
 # 컨텍스트 로거
@@ -48,27 +72,59 @@ class ContextAdapter(logging.LoggerAdapter):
         log.info("start")  # -> record.ctx = {"svc": "...", "env": "..."}
     """
 
+    def __init__(self, logger, extra=None, **kwargs):
+        super().__init__(logger, extra, **kwargs)
+        # 호출 측 extra가 없을 때 그대로 넘길 {"ctx": ...}(로그 호출마다 dict를 새로 만들지 않음)
+        # makeRecord는 extra를 읽기만 하므로 레코드 간에 공유해도 안전
+        self._ctx_singleton = {"ctx": self.extra or {}}
+
     def process(self, msg, kwargs):
         # 호출자가 추가로 extra를 준 경우 병합한다.
         # kwargs["extra"]는 dict여야 하며, 여기서는 {"ctx": {...}} 형태로 강제한다.
-        extra_existing: Dict[str, Any] = kwargs.pop("extra", {}) or {}
-        base_ctx: Dict[str, Any] = self.extra or {}
-        # 기존 ctx와 호출 측 extra가 섞여 들어오면 병합
-        # (충돌 시 호출 측 값이 우선하도록 merge 순서를 조정)
-        merged = {**base_ctx, **extra_existing}
+        extra_existing: Optional[Dict[str, Any]] = kwargs.pop("extra", None)
         # 포맷터는 record.ctx만 본다(일관성). KeyValue/JSON formatter가 처리.
-        kwargs["extra"] = {"ctx": merged}
+        if not extra_existing:
+            # 호출 측 extra가 없으면(대부분의 호출) 병합 없이 바인딩된 ctx를 그대로 공유
+            kwargs["extra"] = self._ctx_singleton
+        else:
+            # 기존 ctx와 호출 측 extra가 섞여 들어오면 병합
+            # (충돌 시 호출 측 값이 우선하도록 merge 순서를 조정)
+            base_ctx: Mapping[str, Any] = self.extra or {}
+            kwargs["extra"] = {"ctx": {**base_ctx, **extra_existing}}
         return msg, kwargs
 
 
-def with_context(logger: logging.Logger, **ctx) -> ContextAdapter:
+def with_context(
+    logger: logging.Logger,
+    ctx: Optional[Mapping[str, Any]] = None,
+    /,
+    **kwargs: Any,
+) -> ContextAdapter:
     """
     로거에 컨텍스트를 바인딩합니다.
     사용 예)
         log = with_context(get_logger(__name__), svc="fx-loader", env="dev")
         log.info("hello")  # -> ctx가 자동 부착
+
+        # 미리 만들어 둔 dict/MappingProxyType을 넘기면 kwargs 재포장 없이 그대로 사용
+        BASE_CTX = MappingProxyType({"svc": "fx-loader", "env": "dev"})
+        log = with_context(get_logger(__name__), BASE_CTX)
+
+    ctx는 읽기 전용(MappingProxyType)으로 고정합니다.
+    process()가 레코드마다 같은 객체를 공유하므로, 실수로 변경되지 않도록 하기 위함입니다.
+    (MappingProxyType은 그대로 쓰고, dict 등은 한 번 복사해 고정하므로 이후 원본 변경은 반영되지 않음)
+    ctx와 kwargs를 함께 주면 병합하며, 충돌 시 kwargs 값이 우선합니다.
     """
-    return ContextAdapter(logger, ctx)
+    if ctx is None:
+        frozen: Mapping[str, Any] = MappingProxyType(kwargs)
+    elif kwargs:
+        frozen = MappingProxyType({**ctx, **kwargs})
+    elif isinstance(ctx, MappingProxyType):
+        frozen = ctx
+    else:
+        # 호출 측이 원본 dict를 계속 수정해도(큐 리스너가 나중에 포맷하는 레코드 포함) 영향 없도록 복사
+        frozen = MappingProxyType(dict(ctx))
+    return ContextAdapter(logger, frozen)
 
 
 # -----------------------------------------------------------------------------
@@ -85,10 +141,16 @@ def timeit(logger: logging.Logger, label: str) -> Callable[[Callable[P, T]], Cal
         def load_fx_bundle(...):
             ...
     """
+    # 호출마다 모듈 속성 조회를 하지 않도록 클로저에 바인딩
+    _pc = time.perf_counter
+
     def decorator(func: Callable[P, T]) -> Callable[P, T]:
         def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
-            t0 = time.perf_counter()
-            logger.debug(f"{label} start")
+            # 시작 시각은 항상 기록: 함수 안에서 setup_logging()으로 레벨이 바뀌는 경우도 있으므로
+            # INFO 여부는 종료 시점(finally)에 판단
+            t0 = _pc()
+            # lazy %-포맷: DEBUG가 꺼져 있으면 문자열을 만들지 않는다
+            logger.debug("%s start", label)
             success = True
             try:
                 return func(*args, **kwargs)
@@ -97,12 +159,15 @@ def timeit(logger: logging.Logger, label: str) -> Callable[[Callable[P, T]], Cal
                 # 예외는 상위로 그대로 던진다(로깅은 finally에서)
                 raise
             finally:
-                dt_ms = (time.perf_counter() - t0) * 1000.0
-                logger.info(
-                    f"{label} done",
-                    # 여기서 extra는 ContextAdapter가 병합하여 record.ctx에 넣는다.
-                    extra={"duration_ms": round(dt_ms, 2), "success": success},
-                )
+                # INFO가 꺼져 있으면 시간 계산/extra 구성 자체를 생략
+                if logger.isEnabledFor(logging.INFO):
+                    dt_ms = (_pc() - t0) * 1000.0
+                    logger.info(
+                        "%s done",
+                        label,
+                        # 여기서 extra는 ContextAdapter가 병합하여 record.ctx에 넣는다.
+                        extra={"duration_ms": round(dt_ms, 2), "success": success},
+                    )
         return wrapper
     return decorator
 
@@ -116,6 +181,7 @@ def log_request(
     url: str,
     *,
     params: Optional[Dict[str, Any]] = None,
+    params_masked: Optional[Dict[str, Any]] = None,
     status: Optional[int] = None,
     attempt: Optional[int] = None,
     wait_s: Optional[float] = None,
@@ -136,6 +202,9 @@ def log_request(
         요청 URL
     params : dict | None
         로그에 남길 파라미터(민감키는 safe_params로 마스킹)
+    params_masked : dict | None
+        이미 safe_params로 마스킹한 파라미터. 주어지면 params 대신 그대로 사용
+        (재시도 루프에서 같은 params를 매번 다시 마스킹하지 않도록)
     status : int | None
         응답 상태코드(재시도/성공/실패 시점에 남김)
     attempt : int | None
@@ -148,10 +217,30 @@ def log_request(
         로그 레벨("INFO", "WARNING", "ERROR"...)
     additional_sensitive_keys : set[str] | None
         추가로 마스킹할 민감 키(런타임 확장)
+
+    정상 응답(INFO, 2xx, 재시도 없음, note 없음/"ok") 로그는
+    환경변수 HTTP_LOG_SAMPLE 비율로만 남깁니다(tail sampling). 오류/재시도 로그는 항상 남습니다.
     """
+    lvl = _resolve_level(level)
+    # 해당 레벨이 꺼져 있으면 payload 구성/마스킹 없이 바로 반환
+    if not logger.isEnabledFor(lvl):
+        return
+    # 정상 응답 로그는 샘플링(payload 구성 전에 결정)
+    if (
+        _HTTP_SUCCESS_SAMPLE_RATE < 1.0
+        and lvl == logging.INFO
+        and status is not None and 200 <= status < 300
+        and not attempt
+        and note in (None, "ok")
+        and _rand() >= _HTTP_SUCCESS_SAMPLE_RATE
+    ):
+        return
+
     payload = {"method": method, "url": url}
 
-    if params is not None:
+    if params_masked is not None:
+        payload["params"] = params_masked
+    elif params is not None:
         payload["params"] = safe_params(params, additional_sensitive_keys)
     if status is not None:
         payload["status"] = status
@@ -162,7 +251,6 @@ def log_request(
     if note:
         payload["note"] = note
 
-    lvl = getattr(logging, level.upper(), logging.INFO)
     # 전달받은 logger 그대로 사용(컨텍스트/이름 유지)
     logger.log(lvl, "http_call", extra=payload)
 
@@ -177,6 +265,11 @@ def sampled(logger: logging.Logger, p: float, level: str, msg: str, **extra) ->
     사용 예)
         sampled(log, 0.1, "INFO", "tick_event", symbol="BTCUSDT", price=...)
     """
-    p = max(0.0, min(1.0, p))
-    if random.random() < p:
-        logger.log(getattr(logging, level.upper(), logging.INFO), msg, extra=extra)
+    lvl = _resolve_level(level)
+    # p<=0 이거나 레벨이 꺼져 있으면 난수 생성 없이 바로 반환
+    if p <= 0.0 or not logger.isEnabledFor(lvl):
+        return
+    # p>=1 이면 항상 기록(난수 생략)
+    if p < 1.0 and _rand() >= p:
+        return
+    logger.log(lvl, msg, extra=extra)
@@ -6,55 +6,98 @@ logging_config.py
 핵심 기능
 - setup_logging(): 루트 로거에 콘솔/파일 핸들러를 장착하고 포맷(텍스트/JSON)을 결정
 - KeyValueFormatter: 텍스트 기반 '시간 | 레벨 | 로거명 | 메시지 | key=value ...'
-- JSONFormatter: 한 줄 JSON 라인 로깅(ELK/CloudWatch 적재 편리)
+- JSONFormatter: 한 줄 JSON 라인 로깅(ELK/CloudWatch 적재 편리, orjson 있으면 사용)
+- JSONBytesStreamHandler: JSON 라인을 bytes 그대로 stream.buffer에 기록
 - safe_params(): 로그에 남기기 전 민감 키 자동 마스킹
 - get_logger(): 모듈/패키지 단위 로거 획득
 
 설계 포인트
 - '한 번만' 초기화되도록 _initialized 플래그로 중복 방지
+- 기본은 QueueHandler → QueueListener 구조(포맷/IO를 백그라운드 스레드로 분리)
 - JSON 포맷 시 공통 메타(host, pid, thread)를 자동 포함
 - record.ctx 만 사용(포맷터 일관성)
 """
 
 from __future__ import annotations
 
+import atexit
+import codecs
+import copy
 import json
 import logging
 import os
+import queue
 import socket
+import time
+from functools import lru_cache
 from logging import Logger
-from logging.handlers import RotatingFileHandler
-from typing import Any, Dict, Optional, Set
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Any, Dict, Mapping, Optional, Set
+
+# JSON 직렬화: orjson이 있으면 사용(C 구현이라 레코드당 직렬화 비용이 작음), 없으면 표준 json
+# orjson은 항상 UTF-8로 출력하므로 표준 json의 ensure_ascii=False와 같은 결과(공백 없는 compact 형식)
+try:
+    import orjson
+
+    # 표준 json처럼 ctx의 비문자열 키(int 등)도 문자열로 직렬화
+    _ORJSON_OPT = orjson.OPT_NON_STR_KEYS
+    _ORJSON_OPT_LINE = orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE
+
+    def _json_dumps_line(obj: Any) -> bytes:
+        # 줄바꿈까지 orjson이 붙여서 반환(별도 bytes 연결 없음)
+        return orjson.dumps(obj, option=_ORJSON_OPT_LINE)
+
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj, option=_ORJSON_OPT).decode("utf-8")
+except ImportError:  # pragma: no cover - 선택 의존성
+    def _json_dumps(obj: Any) -> str:
+        return json.dumps(obj, ensure_ascii=False)
+
+    def _json_dumps_line(obj: Any) -> bytes:
+        return (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
 
 
 # -----------------------------------------------------------------------------
 # 내부 상태: 중복 초기화 방지 플래그
 # -----------------------------------------------------------------------------
 _initialized = False
+# queue 모드일 때 실제 핸들러를 돌리는 백그라운드 리스너(종료 시 atexit로 정리)
+_listener: Optional[QueueListener] = None
+
+# JSON 로그 공통 메타: 호스트명은 프로세스당 한 번만 조회
+_HOSTNAME = socket.gethostname()
 
 
 # -----------------------------------------------------------------------------
 # 레벨 문자열 → 숫자 매핑
 # -----------------------------------------------------------------------------
 _LEVELS = {
+    "NOTSET": logging.NOTSET,
     "DEBUG": logging.DEBUG,
     "INFO": logging.INFO,
+    "WARN": logging.WARNING,
     "WARNING": logging.WARNING,
     "ERROR": logging.ERROR,
+    "FATAL": logging.CRITICAL,
     "CRITICAL": logging.CRITICAL,
 }
+# 소문자 키도 함께 등록: 호출마다 str.upper() 하지 않고 바로 조회
+_LEVELS.update({k.lower(): v for k, v in _LEVELS.items()})
 
 
-def _to_level(level: str | int) -> int:
+def _resolve_level(level: str | int) -> int:
     """
-    레벨을 숫자형으로 변환합니다.
+    레벨을 숫자형으로 변환합니다(setup_logging, log_request/sampled 등에서 공용).
     - 숫자를 그대로 주면 그대로 반환
-    - 문자열이면 대문자로 바꿔 매핑 테이블 조회
-    - 매핑 실패 시 INFO 기본값
+    - 문자열은 대문자/소문자 키로 매핑 테이블 바로 조회
+    - "Info" 같은 혼합 표기만 대문자로 바꿔 재조회, 실패 시 INFO 기본값
     """
     if isinstance(level, int):
         return level
-    return _LEVELS.get(str(level).upper(), logging.INFO)
+    lvl = _LEVELS.get(level)
+    if lvl is None:
+        lvl = _LEVELS.get(str(level).upper(), logging.INFO)
+    return lvl
 
 
 # -----------------------------------------------------------------------------
@@ -68,6 +111,15 @@ _SENSITIVE_KEYS_DEFAULT: Set[str] = {
 }
 
 
+@lru_cache(maxsize=32)
+def _merge_sensitive(extra: frozenset) -> frozenset:
+    """
+    기본 민감 키 + 호출 측 추가 키(소문자화)의 합집합.
+    같은 추가 키 집합이 반복되면 캐시된 결과를 재사용합니다(setup_logging에서 기본 키가 바뀌면 cache_clear).
+    """
+    return frozenset(_SENSITIVE_KEYS_DEFAULT) | {k.lower() for k in extra}
+
+
 def safe_params(
     params: Optional[Dict[str, Any]],
     additional_keys: Optional[Set[str]] = None,
@@ -85,76 +137,169 @@ def safe_params(
     Returns
     -------
     dict | None
-        마스킹된 새 딕셔너리. dict가 아니면 원본 그대로 반환.
+        마스킹된 새 딕셔너리(민감 키가 없어도 복사본). dict가 아니면 원본 그대로 반환.
     """
     if not isinstance(params, dict):
         return params
 
     # 민감 키 집합 구성(기본 + 추가)
-    sensitive = {k.lower() for k in _SENSITIVE_KEYS_DEFAULT}
+    # 기본 집합은 이미 소문자(setup_logging도 소문자로 확장)라 호출마다 다시 만들지 않는다
     if additional_keys:
-        sensitive |= {k.lower() for k in additional_keys}
+        sensitive = _merge_sensitive(frozenset(additional_keys))
+    else:
+        sensitive = _SENSITIVE_KEYS_DEFAULT
+
+    low = str.lower
+    # 민감 키가 하나도 없으면(대부분의 요청) 키별 마스킹 없이 얕은 복사만 반환
+    # (원본을 그대로 넘기면 큐 리스너가 나중에 포맷할 때 호출 측의 이후 변경이 반영됨)
+    if sensitive.isdisjoint(map(low, params)):
+        return dict(params)
 
     redacted: Dict[str, Any] = {}
     for k, v in params.items():
-        redacted[k] = "***" if k.lower() in sensitive else v
+        redacted[k] = "***" if low(k) in sensitive else v
     return redacted
 
 
 # -----------------------------------------------------------------------------
 # 포맷터: 텍스트 / JSON
 # -----------------------------------------------------------------------------
-class KeyValueFormatter(logging.Formatter):
+class _CachedTimeFormatter(logging.Formatter):
+    """
+    formatTime의 초 단위 문자열을 캐시하는 Formatter 베이스.
+    - 같은 초에 찍힌 레코드는 strftime 없이 msec 부분만 붙임(출력은 logging.Formatter와 동일)
+    """
+    _time_cache: tuple = (None, None, "")
+
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        sec = int(record.created)
+        fmt = datefmt or self.default_time_format
+        c_sec, c_fmt, prefix = self._time_cache
+        if sec != c_sec or fmt != c_fmt:
+            prefix = time.strftime(fmt, self.converter(record.created))
+            # (초, 포맷, 결과)를 튜플 하나로 교체해 스레드 간에도 값의 짝이 어긋나지 않게 함
+            self._time_cache = (sec, fmt, prefix)
+        if datefmt or not self.default_msec_format:
+            return prefix
+        return self.default_msec_format % (prefix, record.msecs)
+
+
+class KeyValueFormatter(_CachedTimeFormatter):
     """
     텍스트 포맷터.
     - 기본 포맷: "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
-    - record.ctx(dict)가 있으면 message 뒤에 'key=value key=value ...'를 덧붙임
+    - record.ctx(dict/Mapping)가 있으면 message 뒤에 'key=value key=value ...'를 덧붙임
     """
 
     def format(self, record: logging.LogRecord) -> str:
         base = super().format(record)
         ctx = getattr(record, "ctx", None)
 
-        if not (isinstance(ctx, dict) and ctx):
+        if not (isinstance(ctx, Mapping) and ctx):
             return base
 
+        # ctx는 보통 10개 이하라 제너레이터보다 리스트 컴프리헨션 join이 빠름
+        kv = " ".join([f"{k}={v}" for k, v in ctx.items()])
+
+        # 예외/스택 정보가 없고 한 줄짜리 메시지면(대부분) splitlines 없이 바로 부착
+        if not (record.exc_info or record.exc_text or record.stack_info) and "\n" not in base:
+            return f"{base} | {kv}"
+
         # 스택트레이스가 포함된 경우 base는 여러 줄입니다.
         lines = base.splitlines()
         head = lines[0]
         tail = lines[1:]
 
         # 첫 줄에만 ctx를 key=value로 부착
-        kv = " ".join(f"{k}={v}" for k, v in ctx.items())
         head_with_ctx = f"{head} | {kv}"
 
         return "\n".join([head_with_ctx, *tail]) if tail else head_with_ctx
 
-class JSONFormatter(logging.Formatter):
+class JSONFormatter(_CachedTimeFormatter):
     """
     JSON 라인 포맷터.
     - 모든 로그를 한 줄 JSON으로 직렬화
     - 공통 메타(호스트명/프로세스ID/스레드명) 자동 포함
-    - record.ctx(dict)가 있으면 'ctx' 필드에 포함
+    - record.ctx(dict/Mapping)가 있으면 'ctx' 필드에 포함
     - 예외가 있으면 'exc_info'에 스택 문자열 포함
     """
-    _host = socket.gethostname()
 
     def format(self, record: logging.LogRecord) -> str:
+        return _json_dumps(self._payload(record))
+
+    def format_bytes(self, record: logging.LogRecord) -> bytes:
+        """JSONBytesStreamHandler용: str 변환 없이 줄바꿈 포함 UTF-8 bytes 한 줄로 직렬화"""
+        return _json_dumps_line(self._payload(record))
+
+    def _payload(self, record: logging.LogRecord) -> Dict[str, Any]:
         payload: Dict[str, Any] = {
             "ts": self.formatTime(record, self.datefmt),  # ISO가 필요하면 datefmt/Converter 커스텀
             "level": record.levelname,
             "logger": record.name,
             "msg": record.getMessage(),
-            "host": self._host,
+            "host": _HOSTNAME,
             "pid": record.process,
             "thread": record.threadName,
         }
         ctx = getattr(record, "ctx", None)
-        if isinstance(ctx, dict) and ctx:
-            payload["ctx"] = ctx
+        if isinstance(ctx, Mapping) and ctx:
+            # with_context의 ctx는 읽기 전용 MappingProxyType이라 json 직렬화를 위해 dict로 변환
+            payload["ctx"] = ctx if isinstance(ctx, dict) else dict(ctx)
         if record.exc_info:
             payload["exc_info"] = self.formatException(record.exc_info)
-        return json.dumps(payload, ensure_ascii=False)
+        return payload
+
+
+@lru_cache(maxsize=8)
+def _is_utf8(encoding: Optional[str]) -> bool:
+    """스트림 인코딩이 UTF-8인지(별칭 'utf8', 'UTF-8' 등 포함). 알 수 없으면 False"""
+    if not encoding:
+        return False
+    try:
+        return codecs.lookup(encoding).name == "utf-8"
+    except LookupError:
+        return False
+
+
+class JSONBytesStreamHandler(logging.StreamHandler):
+    """
+    JSONFormatter 전용 스트림 핸들러.
+    - 포맷터의 bytes 출력을 stream.buffer에 바로 기록(str → UTF-8 재인코딩 생략)
+    - buffer가 없는 스트림(StringIO 등), UTF-8이 아닌 스트림(cp949 등), 다른 포맷터면 기본 StreamHandler와 동일하게 동작
+    """
+
+    def emit(self, record: logging.LogRecord) -> None:
+        fmt = self.formatter
+        stream = self.stream
+        buf = getattr(stream, "buffer", None)
+        if buf is None or not isinstance(fmt, JSONFormatter) or not _is_utf8(getattr(stream, "encoding", None)):
+            super().emit(record)
+            return
+        try:
+            # 텍스트 계층에 남아 있는 쓰기를 먼저 내보내야 출력 순서가 섞이지 않음
+            stream.flush()
+            buf.write(fmt.format_bytes(record))
+            self.flush()
+        except RecursionError:  # 표준 Handler와 동일하게 재귀 오류는 그대로 전파
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+class _LocalQueueHandler(QueueHandler):
+    """
+    같은 프로세스 내 queue.Queue 전용 QueueHandler.
+    - 기본 prepare()는 (피클링을 위해) 메시지에 traceback을 합치고 exc_info를 지우는데,
+      그러면 JSONFormatter의 exc_info 필드가 사라지므로 메시지만 확정하고 예외/스택 정보는 그대로 넘긴다.
+    - 포맷/IO는 리스너 스레드에서 실제 핸들러가 수행
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        # args가 나중에 바뀌어도 영향 없도록 여기서 메시지를 확정
+        record.msg = record.getMessage()
+        record.args = None
+        return record
 
 
 # -----------------------------------------------------------------------------
@@ -170,6 +315,7 @@ def setup_logging(
     propagate_root: bool = False,
     # ↓ 추가 민감 키를 설정에서 주입할 수 있게 함
     extra_sensitive_keys: Optional[Set[str]] = None,
+    use_queue: bool = True,
 ) -> None:
     """
     루트 로거에 콘솔/파일 핸들러를 장착하고, 포맷(텍스트/JSON)을 설정합니다.
@@ -192,8 +338,11 @@ def setup_logging(
         루트 로거를 상위 로거에 전파할지 여부(일반적으로 False 권장)
     extra_sensitive_keys : set[str] | None
         마스킹 대상 민감 키를 런타임에 추가 확장
+    use_queue : bool
+        True면 루트에는 QueueHandler만 달고, 콘솔/파일 핸들러는 QueueListener 스레드에서 실행
+        (로그 호출 스레드는 큐에 넣기만 하고 포맷/디스크 IO를 기다리지 않음)
     """
-    global _initialized, _SENSITIVE_KEYS_DEFAULT
+    global _initialized, _SENSITIVE_KEYS_DEFAULT, _listener
 
     # 중복 초기화 방지: 핸들러 존재 여부가 아니라 '우리 의도' 플래그로 제어
     if _initialized:
@@ -203,9 +352,10 @@ def setup_logging(
     # 민감 키 확장(대소문자 무시)
     if extra_sensitive_keys:
         _SENSITIVE_KEYS_DEFAULT |= {k.lower() for k in extra_sensitive_keys}
+        _merge_sensitive.cache_clear()
 
     root = logging.getLogger()
-    root.setLevel(_to_level(level))
+    root.setLevel(_resolve_level(level))
     root.propagate = propagate_root  # 일반적으로 False: 상위 로거로 중복 전파 방지
 
     # 포맷터 선택(텍스트 / JSON)
@@ -217,10 +367,10 @@ def setup_logging(
         formatter.default_time_format = "%Y-%m-%dT%H:%M:%S"
         formatter.default_msec_format = "%s.%03d"
 
-    # 콘솔 핸들러
-    sh = logging.StreamHandler()
+    # 콘솔 핸들러(JSON이면 bytes를 stream.buffer에 바로 쓰는 핸들러 사용)
+    sh = JSONBytesStreamHandler() if json_format else logging.StreamHandler()
     sh.setFormatter(formatter)
-    root.addHandler(sh)
+    handlers: list[logging.Handler] = [sh]
 
     # 파일 핸들러(선택)
     if log_path:
@@ -233,7 +383,19 @@ def setup_logging(
             from logging import FileHandler
             fh = FileHandler(log_path, encoding="utf-8")
         fh.setFormatter(formatter)
-        root.addHandler(fh)
+        handlers.append(fh)
+
+    if use_queue:
+        # 로그 호출 측은 큐에 넣기만 하고, 포맷/쓰기는 리스너 스레드가 담당
+        q: queue.Queue = queue.Queue(-1)
+        root.addHandler(_LocalQueueHandler(q))
+        _listener = QueueListener(q, *handlers, respect_handler_level=True)
+        _listener.start()
+        # 종료 시 큐에 남은 레코드까지 모두 처리하고 스레드 정리
+        atexit.register(_listener.stop)
+    else:
+        for h in handlers:
+            root.addHandler(h)
 
 
 def get_logger(name: str) -> Logger: